@@ -1,18 +1,40 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, g, Response, has_request_context, stream_with_context
 import requests
+import click
+import io
 import json
+import logging
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime, timedelta
 import calendar
-from sqlalchemy import func
+from sqlalchemy import func, event
+from sqlalchemy.engine import Engine
+import metrics
+import task_io
+import normalize
+import layout
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Leveled logging; set LOG_LEVEL=DEBUG to see provider chatter
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'WARNING').upper(),
+    format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Provider base URLs, overridable to point at a local stub (see bench/stub_llm.py)
+OPENAI_API_BASE = os.getenv('OPENAI_API_BASE', 'https://api.openai.com').rstrip('/')
+GEMINI_API_BASE = os.getenv('GEMINI_API_BASE', 'https://generativelanguage.googleapis.com').rstrip('/')
+
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///tasks.db'
+# Not DATABASE_URL: hosts such as Heroku set that to a postgres:// URL for their own add-ons
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('TASKS_DATABASE_URL', 'sqlite:///tasks.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db = SQLAlchemy(app)
 
@@ -25,6 +47,11 @@ class TaskCompletion(db.Model):
     impact_score = db.Column(db.Integer)
     effort_score = db.Column(db.Integer)
     
+    # Lookup index for import dedupe on (task_name, goal, completed_at)
+    __table_args__ = (
+        db.Index('ix_task_completion_dedupe', 'task_name', 'goal', 'completed_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -35,6 +62,89 @@ class TaskCompletion(db.Model):
             'effort_score': self.effort_score
         }
 
+# Metrics, exposed on /metrics in Prometheus text format. With several
+# gunicorn workers set METRICS_DIR (see Procfile) so /metrics adds up every
+# worker; otherwise each series carries a `worker` label.
+registry = metrics.Registry(shared_dir=os.getenv('METRICS_DIR'))
+request_seconds = registry.histogram(
+    'http_request_duration_seconds', 'Request latency by route',
+    labels=('route', 'method', 'status')
+)
+db_queries_per_request = registry.histogram(
+    'db_queries_per_request', 'Database queries issued per request',
+    labels=('route',), buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500)
+)
+provider_calls_total = registry.counter(
+    'ai_provider_calls_total', 'AI provider calls by outcome',
+    labels=('provider', 'outcome')
+)
+provider_call_seconds = registry.histogram(
+    'ai_provider_call_duration_seconds', 'AI provider call latency',
+    labels=('provider',)
+)
+ai_fallbacks_total = registry.counter(
+    'ai_fallbacks_total', 'Prompts answered by the fallback because no provider succeeded'
+)
+ai_parse_failures_total = registry.counter(
+    'ai_parse_failures_total', 'AI responses that could not be parsed as JSON'
+)
+cache_lookups_total = registry.counter(
+    'cache_lookups_total', 'Cache lookups by cache and result',
+    labels=('cache', 'result')
+)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def count_db_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+
+# Tables are created on the first request (and by the CLI commands) rather
+# than at import, so tools that import this module (parser.py) don't touch
+# the database
+tables_created = False
+tables_lock = threading.Lock()
+
+@app.before_request
+def create_tables():
+    global tables_created
+    if tables_created:
+        return
+    with tables_lock:
+        if not tables_created:
+            db.create_all()
+            tables_created = True
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.db_queries = 0
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    method = request.method
+    request_g = g._get_current_object()
+    
+    def record():
+        request_seconds.observe(
+            time.perf_counter() - request_g.request_start,
+            route=route, method=method, status=response.status_code
+        )
+        db_queries_per_request.observe(request_g.get('db_queries', 0), route=route)
+        registry.maybe_dump()
+    
+    if response.is_streamed:
+        # The body (e.g. /export) is generated after this hook returns, so
+        # record once the server has finished sending it
+        response.call_on_close(record)
+    else:
+        record()
+    return response
+
+@app.route("/metrics")
+def metrics_endpoint():
+    return Response(registry.render(), content_type=metrics.CONTENT_TYPE)
+
 @app.route("/")
 def index():
     return render_template("index.html")
@@ -53,75 +163,223 @@ def analyze():
         if not goal or not tasks:
             return jsonify({"error": "Goal and tasks are required"}), 400
         
-        # Get AI analysis
+        # Get AI analysis (scores and emoji only - prose comes from /analyze/detail)
         analyzed_tasks = get_ai_analysis(goal, tasks)
         
-        return jsonify({"analyzed_tasks": analyzed_tasks})
+        response = {"analyzed_tasks": analyzed_tasks}
+        if data.get('layout'):
+            # Precomputed positions so the client only has to draw
+            response["layout"] = layout.compute_layout(analyzed_tasks)
+        
+        return jsonify(response)
     
     except Exception as e:
-        print(f"Error in analyze endpoint: {e}")
-        print(f"Goal: {data.get('goal', 'None')}")
-        print(f"Tasks: {data.get('tasks', 'None')}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in analyze endpoint")
         return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
 
+@app.route("/analyze/detail", methods=["POST"])
+def analyze_detail():
+    try:
+        data = request.get_json()
+        goal = data.get('goal', '')
+        tasks = data.get('tasks', [])
+        task_name = data.get('task_name', '')
+        
+        if not goal or not tasks or not task_name:
+            return jsonify({"error": "Goal, tasks and task_name are required"}), 400
+        if not isinstance(tasks, list) or not all(isinstance(task, str) for task in tasks):
+            return jsonify({"error": "tasks must be a list of strings"}), 400
+        if not isinstance(goal, str) or not isinstance(task_name, str):
+            return jsonify({"error": "goal and task_name must be strings"}), 400
+        if task_name not in tasks:
+            return jsonify({"error": "task_name must be one of tasks"}), 400
+        
+        # Scores from /analyze, so the prose explains the scores on screen
+        try:
+            impact = int(data['impact']) if data.get('impact') is not None else None
+            effort = int(data['effort']) if data.get('effort') is not None else None
+        except (TypeError, ValueError):
+            return jsonify({"error": "impact and effort must be integers"}), 400
+        
+        detail = get_task_detail(goal, tasks, task_name, impact, effort)
+        if detail is None:
+            # Error status so the client shows its retry message instead of saving this
+            return jsonify({"error": "AI providers are unavailable, please try again"}), 502
+        
+        return jsonify({"task_name": task_name, **detail})
+    
+    except Exception as e:
+        logger.exception("Error in analyze detail endpoint")
+        return jsonify({"error": f"Detail analysis failed: {str(e)}"}), 500
+
+# Analyses keyed by canonical form, so trivially different requests (case,
+# whitespace, punctuation, task order) reuse the same provider result.
+# Set ANALYSIS_FUZZY_THRESHOLD (e.g. 0.8) to also match near-duplicates.
+analysis_index = normalize.AnalysisIndex(
+    max_size=int(os.getenv('ANALYSIS_CACHE_SIZE', 1000)),
+    fuzzy_threshold=float(os.getenv('ANALYSIS_FUZZY_THRESHOLD', 0)) or None
+)
+
 def get_ai_analysis(goal, tasks):
     """
     Get AI analysis using OpenAI API or fallback to Gemini
     """
-    print("=== API KEY DEBUG INFO ===")
-    
-    # Debug environment loading
-    print(f"Current working directory: {os.getcwd()}")
-    print(f".env file exists: {os.path.exists('.env')}")
-    
-    # Try OpenAI first (if API key is available)
-    openai_key = os.getenv('OPENAI_API_KEY')
-    print(f"OpenAI key found: {'Yes' if openai_key else 'No'}")
-    if openai_key:
-        print(f"OpenAI key length: {len(openai_key)}")
-        print(f"OpenAI key starts with: {openai_key[:10]}...")
-        # Remove quotes if present
-        openai_key = openai_key.strip("'\"")
-        print(f"Trying OpenAI API...")
-        try:
-            result = call_openai_api(goal, tasks, openai_key)
-            print("OpenAI API succeeded!")
-            return result
-        except Exception as e:
-            print(f"OpenAI API failed: {e}")
-            import traceback
-            traceback.print_exc()
-    
-    # Try Gemini as fallback
-    gemini_key = os.getenv('GEMINI_API_KEY')
-    print(f"Gemini key found: {'Yes' if gemini_key else 'No'}")
-    if gemini_key:
-        print(f"Gemini key length: {len(gemini_key)}")
-        print(f"Gemini key starts with: {gemini_key[:10]}...")
-        gemini_key = gemini_key.strip("'\"")
-        print(f"Trying Gemini API...")
-        try:
-            result = call_gemini_api(goal, tasks, gemini_key)
-            print("Gemini API succeeded!")
-            return result
-        except Exception as e:
-            print(f"Gemini API failed: {e}")
-            import traceback
-            traceback.print_exc()
+    analysis = get_provider_analysis(goal, tasks)
+    if analysis is not None:
+        return analysis
     
     # If no API keys or both fail, return fallback
-    print("No API keys found or all APIs failed, using fallback")
-    print("=== END DEBUG INFO ===")
     return get_fallback_analysis(goal, tasks)
 
-def call_openai_api(goal, tasks, api_key):
-    """Call OpenAI API for task analysis"""
-    prompt = create_analysis_prompt(goal, tasks)
+def get_provider_analysis(goal, tasks):
+    """Analysis from the index or an AI provider, or None if neither has one"""
+    cached, match = analysis_index.get(goal, tasks)
+    if cached is not None:
+        cache_lookups_total.inc(cache='analysis', result=f'{match}_hit')
+        return cached
+    cache_lookups_total.inc(cache='analysis', result='miss')
+    
+    result = call_ai_providers(create_analysis_prompt(goal, tasks))
+    if result is not None and not is_analysis_reply(result):
+        logger.warning("AI analysis reply is not a list of task objects, using fallback")
+        result = None
+    if result is not None:
+        # Fallback results aren't stored so a later call can still reach the AI
+        analysis_index.put(goal, tasks, result)
+        # Read back so task names are the request's, not the model's rewording
+        stored, _ = analysis_index.get(goal, tasks)
+        return stored if stored is not None else result
+    return None
+
+def is_analysis_reply(result):
+    """True if a provider reply is a non-empty list of task objects"""
+    return isinstance(result, list) and bool(result) and all(isinstance(item, dict) for item in result)
+
+def warm_analysis_index(path):
+    """Seed analysis_index from `parser.py` output, one {"goal", "tasks", "analyzed_tasks"} object per line"""
+    loaded = 0
+    try:
+        f = open(path, encoding='utf-8')
+    except OSError as e:
+        logger.warning("Could not read ANALYSIS_WARM_FILE: %s", e)
+        return
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                goal, tasks, analysis = record['goal'], record['tasks'], record['analyzed_tasks']
+            except (ValueError, KeyError, TypeError):
+                continue
+            if not isinstance(goal, str) or not isinstance(tasks, list) or not all(isinstance(task, str) for task in tasks):
+                continue
+            if is_analysis_reply(analysis):
+                analysis_index.put(goal, tasks, analysis)
+                loaded += 1
+    logger.info("Loaded %d analyses from %s", loaded, path)
+
+# Cache of generated task prose, keyed by canonical (goal, tasks) and task_name.
+# Most tasks are never clicked, so the prose is only generated on demand.
+DETAIL_CACHE_SIZE = 1000
+detail_cache = {}
+detail_cache_lock = threading.Lock()
+
+def get_task_detail(goal, tasks, task_name, impact=None, effort=None):
+    """
+    Get justification/comparison/ranking text for a single task, cached.
+    Returns the placeholder text if no API key is configured, or None if
+    the configured providers failed.
+    """
+    if impact is None or effort is None:
+        # Not sent by the client: use the stored analysis if there is one
+        cached, _ = analysis_index.get(goal, tasks)
+        for item in cached or []:
+            if item['task_name'] == task_name:
+                impact = item.get('impact') if impact is None else impact
+                effort = item.get('effort') if effort is None else effort
+                break
+    
+    cache_key = (
+        normalize.canonical_key(goal, tasks), normalize.normalize_text(task_name), impact, effort
+    )
+    with detail_cache_lock:
+        detail = detail_cache.get(cache_key)
+    if detail is not None:
+        cache_lookups_total.inc(cache='detail', result='hit')
+        return detail
+    cache_lookups_total.inc(cache='detail', result='miss')
+    
+    result = call_ai_providers(create_detail_prompt(goal, tasks, task_name, impact, effort))
+    if isinstance(result, list):
+        result = result[0] if result else None
+    if not isinstance(result, dict):
+        if not has_ai_key():
+            return get_fallback_detail()
+        # Failed or unusable reply; nothing is cached so a retry can still succeed
+        return None
+    
+    detail = {
+        "justification": result.get("justification", ""),
+        "comparison": result.get("comparison", ""),
+        "ranking_reason": result.get("ranking_reason", "")
+    }
+    
+    with detail_cache_lock:
+        if cache_key not in detail_cache and len(detail_cache) >= DETAIL_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            detail_cache.pop(next(iter(detail_cache)))
+        detail_cache[cache_key] = detail
+    return detail
+
+def has_ai_key():
+    """True if an OpenAI or Gemini API key is configured"""
+    return any(os.getenv(env_var, '').strip("'\"") for env_var in ('OPENAI_API_KEY', 'GEMINI_API_KEY'))
+
+def call_ai_providers(prompt):
+    """
+    Run a prompt against OpenAI, then Gemini. Returns the parsed JSON
+    response, or None if no API key is configured or every provider failed.
+    """
+    providers = [
+        ('openai', 'OPENAI_API_KEY', call_openai_api),
+        ('gemini', 'GEMINI_API_KEY', call_gemini_api)
+    ]
+    
+    for provider, env_var, call_api in providers:
+        api_key = os.getenv(env_var)
+        if not api_key:
+            logger.debug("%s not set, skipping %s", env_var, provider)
+            continue
+        
+        # Remove quotes if present
+        api_key = api_key.strip("'\"")
+        logger.debug("Trying %s API", provider)
+        start = time.perf_counter()
+        try:
+            result = call_api(prompt, api_key)
+        except Exception as e:
+            provider_call_seconds.observe(time.perf_counter() - start, provider=provider)
+            provider_calls_total.inc(provider=provider, outcome='failure')
+            # No traceback: exception messages can embed request URLs and headers
+            logger.warning("%s API failed: %s: %s", provider, type(e).__name__, scrub_secret(str(e), api_key))
+            continue
+        
+        provider_call_seconds.observe(time.perf_counter() - start, provider=provider)
+        provider_calls_total.inc(provider=provider, outcome='success')
+        logger.debug("%s API succeeded", provider)
+        return result
     
+    ai_fallbacks_total.inc()
+    logger.info("No API keys found or all APIs failed, using fallback")
+    return None
+
+def scrub_secret(text, secret):
+    """Mask a secret wherever it appears in text"""
+    return text.replace(secret, '***') if secret else text
+
+def call_openai_api(prompt, api_key):
+    """Call OpenAI API with the given prompt"""
     response = requests.post(
-        "https://api.openai.com/v1/chat/completions",
+        f"{OPENAI_API_BASE}/v1/chat/completions",
         headers={
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
@@ -140,14 +398,16 @@ def call_openai_api(goal, tasks, api_key):
     else:
         raise Exception(f"OpenAI API error: {response.status_code}")
 
-def call_gemini_api(goal, tasks, api_key):
-    """Call Gemini API for task analysis"""
-    prompt = create_analysis_prompt(goal, tasks)
-    
+def call_gemini_api(prompt, api_key):
+    """Call Gemini API with the given prompt"""
     # Updated Gemini API endpoint and model name
     response = requests.post(
-        f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={api_key}",
-        headers={"Content-Type": "application/json"},
+        f"{GEMINI_API_BASE}/v1beta/models/gemini-1.5-flash:generateContent",
+        # Key goes in a header, not the URL, so it can't end up in error messages
+        headers={
+            "x-goog-api-key": api_key,
+            "Content-Type": "application/json"
+        },
         json={
             "contents": [{"parts": [{"text": prompt}]}]
         }
@@ -158,11 +418,10 @@ def call_gemini_api(goal, tasks, api_key):
         content = result['candidates'][0]['content']['parts'][0]['text']
         return parse_ai_response(content)
     else:
-        print(f"Gemini API Response: {response.text}")
         raise Exception(f"Gemini API error: {response.status_code} - {response.text}")
 
 def create_analysis_prompt(goal, tasks):
-    """Create the prompt for AI analysis"""
+    """Create the prompt for AI scoring (no prose, see create_detail_prompt)"""
     task_list = '\n'.join([f"{i+1}. {task}" for i, task in enumerate(tasks)])
     
     return f"""
@@ -171,19 +430,10 @@ You are a strategic project manager AI. Analyze these tasks for the goal: "{goal
 Tasks to analyze:
 {task_list}
 
-For each task, provide detailed analysis including comparative insights:
+For each task, provide:
 - impact: Score 1-10 (how directly this contributes to the goal)
 - effort: Score 1-10 (time/difficulty required)  
 - emoji: Single relevant emoji
-- justification: Detailed explanation covering:
-  * WHY this task has its specific impact level
-  * What specific outcomes it enables
-  * How it connects to achieving the main objective
-- comparison: Explain how this task compares to others in the list:
-  * Why it's more/less important than similar tasks
-  * What makes it unique or critical
-  * Which other tasks it should be prioritized over/under and why
-- ranking_reason: Brief explanation of where this task should rank overall and why
 
 Return ONLY a JSON array with this exact format:
 [
@@ -191,13 +441,45 @@ Return ONLY a JSON array with this exact format:
     "task_name": "exact task text",
     "impact": 8,
     "effort": 6,
-    "emoji": "💼",
-    "justification": "HIGH IMPACT: This task directly enables [specific outcome] which is critical for [goal] because [reason].",
-    "comparison": "This task is more critical than [other tasks] because [reason]. However, it should be done after [higher priority task] since [reason].",
-    "ranking_reason": "Ranks #2 overall because it's essential for [outcome] but requires [prerequisite] to be completed first."
+    "emoji": "💼"
   }}
 ]
 
+Score the tasks relative to each other so the most strategic tasks stand out.
+"""
+
+def create_detail_prompt(goal, tasks, task_name, impact=None, effort=None):
+    """Create the prompt for the detailed analysis of a single task"""
+    task_list = '\n'.join([f"{i+1}. {task}" for i, task in enumerate(tasks)])
+    scores = ''
+    if impact is not None and effort is not None:
+        scores = (f"\nThis task has already been scored impact {impact}/10 and effort {effort}/10. "
+                  "Your explanation must be consistent with these scores.\n")
+    
+    return f"""
+You are a strategic project manager AI. The goal is: "{goal}"
+
+All tasks being considered:
+{task_list}
+
+Provide detailed analysis for this task only: "{task_name}"
+{scores}- justification: Detailed explanation covering:
+  * WHY this task has its specific impact level
+  * What specific outcomes it enables
+  * How it connects to achieving the main objective
+- comparison: Explain how this task compares to others in the list:
+  * Why it's more/less important than similar tasks
+  * What makes it unique or critical
+  * Which other tasks it should be prioritized over/under and why
+- ranking_reason: Brief explanation of where this task should rank overall and why
+
+Return ONLY a JSON object with this exact format:
+{{
+  "justification": "HIGH IMPACT: This task directly enables [specific outcome] which is critical for [goal] because [reason].",
+  "comparison": "This task is more critical than [other tasks] because [reason]. However, it should be done after [higher priority task] since [reason].",
+  "ranking_reason": "Ranks #2 overall because it's essential for [outcome] but requires [prerequisite] to be completed first."
+}}
+
 Be very specific about task comparisons and relative priorities. Explain the strategic reasoning behind rankings.
 """
 
@@ -214,19 +496,19 @@ def parse_ai_response(content):
         
         # Parse JSON
         return json.loads(content)
-    except Exception as e:
-        print(f"Failed to parse AI response: {e}")
-        print(f"Raw content: {content}")
+    except Exception:
+        ai_parse_failures_total.inc()
+        logger.warning("Failed to parse AI response", exc_info=True)
+        logger.debug("Raw content: %s", content)
         raise Exception("Failed to parse AI response")
 
 def get_fallback_analysis(goal, tasks):
     """Simple fallback when AI APIs are unavailable"""
-    import hashlib
     import random
     
-    # Use hash of goal+tasks to ensure consistent results
-    content_hash = hashlib.md5((goal + ''.join(tasks)).encode()).hexdigest()
-    random.seed(content_hash)  # Consistent random based on input
+    # Seed each task from the normalized goal + task so trivially different
+    # requests (case, punctuation, task order) get the same scores
+    goal_key = normalize.normalize_text(goal)
     
     # Simple emoji selection
     emojis = ["📋", "💼", "📚", "🔧", "💡", "�", "🚀c", "⚡", "🎨", "🔍", "📝", "💻", "🌟", "🏆", "🔥"]
@@ -234,8 +516,9 @@ def get_fallback_analysis(goal, tasks):
     analyzed = []
     for i, task in enumerate(tasks):
         # Generate consistent but varied scores
-        impact = random.randint(3, 9)
-        effort = random.randint(2, 8)
+        rng = random.Random(f"{goal_key}\n{normalize.normalize_text(task)}")
+        impact = rng.randint(3, 9)
+        effort = rng.randint(2, 8)
         emoji = emojis[i % len(emojis)]
         
         analyzed.append({
@@ -243,13 +526,20 @@ def get_fallback_analysis(goal, tasks):
             "impact": impact,
             "effort": effort,
             "emoji": emoji,
-            "justification": "⚠️ AI analysis not available. Please add an API key to .env file for detailed insights.",
-            "comparison": "⚠️ Task comparison requires AI analysis. Add OPENAI_API_KEY or GEMINI_API_KEY to your .env file.",
-            "ranking_reason": "⚠️ Strategic ranking requires AI analysis. Configure an API key for detailed reasoning."
+            # Fallback prose is free, so include it and skip the detail round trip
+            **get_fallback_detail()
         })
     
     return analyzed
 
+def get_fallback_detail():
+    """Placeholder detail text when AI APIs are unavailable"""
+    return {
+        "justification": "⚠️ AI analysis not available. Please add an API key to .env file for detailed insights.",
+        "comparison": "⚠️ Task comparison requires AI analysis. Add OPENAI_API_KEY or GEMINI_API_KEY to your .env file.",
+        "ranking_reason": "⚠️ Strategic ranking requires AI analysis. Configure an API key for detailed reasoning."
+    }
+
 @app.route("/complete-task", methods=["POST"])
 def complete_task():
     try:
@@ -278,6 +568,74 @@ def complete_task():
         db.session.rollback()
         return jsonify({"error": f"Failed to complete task: {str(e)}"}), 500
 
+@app.route("/export")
+def export_tasks():
+    """Stream every TaskCompletion as NDJSON (default) or CSV"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 400
+    
+    serialize, mimetype = EXPORT_FORMATS[export_format]
+    rows = task_io.iter_completions(db, TaskCompletion)
+    return Response(
+        stream_with_context(serialize(rows)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=tasks.{export_format}"}
+    )
+
+@app.route("/import", methods=["POST"])
+def import_tasks():
+    """Bulk import NDJSON or CSV completions from the request body, skipping duplicates"""
+    try:
+        import_format = request.args.get('format')
+        if import_format is None:
+            import_format = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+        if import_format not in EXPORT_FORMATS:
+            return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 400
+        
+        # Read the body line by line rather than loading it all
+        if import_format == 'csv':
+            records = task_io.parse_csv(io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline=''))
+        else:
+            records = task_io.parse_ndjson(request.stream)
+        counts = task_io.import_records(db, TaskCompletion, records)
+        
+        return jsonify({"message": "Import finished", **counts})
+    
+    except Exception as e:
+        logger.exception("Error in import endpoint")
+        return jsonify({"error": f"Failed to import tasks: {str(e)}"}), 500
+
+EXPORT_FORMATS = {
+    'ndjson': (task_io.to_ndjson, 'application/x-ndjson'),
+    'csv': (task_io.to_csv, 'text/csv')
+}
+
+@app.cli.command("export-tasks")
+@click.argument("output", type=click.File("w", encoding="utf-8"), default="-")
+@click.option("--format", "export_format", type=click.Choice(list(EXPORT_FORMATS)), default="ndjson")
+def export_tasks_command(output, export_format):
+    """Export task history to OUTPUT (default: stdout)."""
+    db.create_all()
+    serialize = EXPORT_FORMATS[export_format][0]
+    for chunk in serialize(task_io.iter_completions(db, TaskCompletion)):
+        output.write(chunk)
+
+@app.cli.command("import-tasks")
+@click.argument("source", type=click.File("r", encoding="utf-8-sig"), default="-")
+@click.option("--format", "import_format", type=click.Choice(list(EXPORT_FORMATS)), default="ndjson")
+@click.option("--chunk-size", default=10000, show_default=True, help="Rows per transaction.")
+def import_tasks_command(source, import_format, chunk_size):
+    """Import task history from SOURCE (default: stdin), skipping duplicates."""
+    db.create_all()
+    if import_format == 'csv':
+        records = task_io.parse_csv(source)
+    else:
+        records = task_io.parse_ndjson(source)
+    counts = task_io.import_records(db, TaskCompletion, records, chunk_size=chunk_size)
+    click.echo(f"Inserted {counts['inserted']}, skipped {counts['duplicates']} duplicates "
+               f"and {counts['invalid']} invalid rows", err=True)
+
 @app.route("/task-stats")
 def task_stats():
     try:
@@ -377,12 +735,11 @@ def calculate_longest_streak():
     
     return longest
 
+# Reuse analyses saved by `python parser.py` across restarts
+if os.getenv('ANALYSIS_WARM_FILE'):
+    warm_analysis_index(os.getenv('ANALYSIS_WARM_FILE'))
+
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
     app.run(debug=True, port=5001, host='0.0.0.0')
-
-# Production deployment
-if __name__ != "__main__":
-    with app.app_context():
-        db.create_all()
\ No newline at end of file
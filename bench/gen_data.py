@@ -0,0 +1,94 @@
+"""
+Fill TaskCompletion with synthetic history for benchmarking.
+
+Uses the app's database, so point TASKS_DATABASE_URL at a scratch file:
+    TASKS_DATABASE_URL=sqlite:////tmp/bench.db python -m bench.gen_data --years 3
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+GOALS = [
+    "Get a job as a Software Engineer",
+    "Run a marathon",
+    "Launch a side project",
+    "Learn Spanish",
+    "Write a book"
+]
+
+TASKS = [
+    "Apply to jobs on LinkedIn",
+    "Build a portfolio website",
+    "Practice coding interviews",
+    "Update my resume",
+    "Attend tech meetups",
+    "Go for a long run",
+    "Write 1000 words",
+    "Review flashcards",
+    "Ship a feature",
+    "Read a chapter"
+]
+
+def generate_rows(years, per_day, skip_rate=0.2, seed=0, end=None):
+    """
+    Yield completion rows covering `years` years up to `end`.
+    Each day gets 0..2*per_day completions; `skip_rate` of days are empty
+    so streaks look realistic.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.utcnow()
+    day = end - timedelta(days=int(365 * years))
+
+    while day <= end:
+        if rng.random() >= skip_rate:
+            for _ in range(rng.randint(0, 2 * per_day)):
+                yield {
+                    'task_name': rng.choice(TASKS),
+                    'goal': rng.choice(GOALS),
+                    # Capped so today's rows aren't in the future
+                    'completed_at': min(end, day.replace(
+                        hour=rng.randint(0, 23), minute=rng.randint(0, 59), second=rng.randint(0, 59)
+                    )),
+                    'impact_score': rng.randint(1, 10),
+                    'effort_score': rng.randint(1, 10)
+                }
+        day += timedelta(days=1)
+
+def populate(db, model, rows, chunk_size=5000):
+    """Bulk insert rows in chunks; returns the number inserted"""
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            db.session.execute(model.__table__.insert(), chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(model.__table__.insert(), chunk)
+        total += len(chunk)
+    db.session.commit()
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=float, default=1)
+    parser.add_argument('--per-day', type=int, default=5, help='average completions per active day')
+    parser.add_argument('--skip-rate', type=float, default=0.2, help='fraction of days with no completions')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reset', action='store_true', help='delete existing completions first')
+    args = parser.parse_args()
+
+    from app import app, db, TaskCompletion
+
+    with app.app_context():
+        db.create_all()
+        if args.reset:
+            TaskCompletion.query.delete()
+            db.session.commit()
+        rows = generate_rows(args.years, args.per_day, args.skip_rate, args.seed)
+        total = populate(db, TaskCompletion, rows)
+    print(f"Inserted {total} completions into {app.config['SQLALCHEMY_DATABASE_URI']}")
+
+if __name__ == "__main__":
+    main()
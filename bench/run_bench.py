@@ -0,0 +1,283 @@
+"""
+Micro and load benchmarks for /analyze, /task-stats and /complete-task.
+
+    # In-process, against a scratch database seeded with synthetic history
+    python -m bench.run_bench micro --years 3 --iterations 200
+    python -m bench.run_bench micro --provider stub --stub-latency-ms 300
+
+    # Over HTTP, against a running server (start the stub + app yourself)
+    python -m bench.run_bench load --url http://127.0.0.1:5001 --concurrency 8
+
+    # Compare two saved runs
+    python -m bench.run_bench compare bench/results/a.json bench/results/b.json
+
+Every run reports p50/p95/p99 latency and throughput per route and is saved
+to bench/results/ (pass --baseline to diff against an earlier run).
+
+Each /analyze call sends a distinct goal so the provider path is measured
+rather than the analysis index; pass --repeat-input to measure cache hits.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+SAMPLE_GOAL = "Get a job as a Software Engineer"
+SAMPLE_TASKS = [
+    "Apply to 15 jobs on LinkedIn",
+    "Build a portfolio website",
+    "Practice coding interviews",
+    "Update my resume",
+    "Attend tech meetups"
+]
+
+# Tags every /analyze goal, so goals stay distinct across runs against the same server
+RUN_ID = uuid.uuid4().hex[:8]
+
+def analyze_payload(i, repeat_input):
+    # A distinct goal per call, so the analysis index can't answer it and
+    # the provider path is measured; --repeat-input measures cache hits
+    goal = SAMPLE_GOAL if repeat_input else f"{SAMPLE_GOAL} {RUN_ID}-{i}"
+    return {'goal': goal, 'tasks': SAMPLE_TASKS}
+
+def complete_task_payload(i, repeat_input):
+    return {
+        'task_name': SAMPLE_TASKS[i % len(SAMPLE_TASKS)],
+        'goal': SAMPLE_GOAL,
+        'impact_score': 7,
+        'effort_score': 4
+    }
+
+# name -> (method, path, payload builder or None)
+ROUTES = {
+    'analyze': ('POST', '/analyze', analyze_payload),
+    'task-stats': ('GET', '/task-stats', None),
+    'complete-task': ('POST', '/complete-task', complete_task_payload)
+}
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(latencies, errors, wall_seconds):
+    """Latency stats in milliseconds plus throughput in requests/second"""
+    values = sorted(latency * 1000 for latency in latencies)
+    count = len(values)
+    return {
+        'count': count,
+        'errors': errors,
+        'mean_ms': sum(values) / count if count else 0.0,
+        'min_ms': values[0] if values else 0.0,
+        'p50_ms': percentile(values, 50),
+        'p95_ms': percentile(values, 95),
+        'p99_ms': percentile(values, 99),
+        'max_ms': values[-1] if values else 0.0,
+        'throughput_rps': count / wall_seconds if wall_seconds else 0.0
+    }
+
+def run_micro(args):
+    """Benchmark routes in-process with Flask's test client"""
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bench-'), 'bench.db')
+    os.environ['TASKS_DATABASE_URL'] = f"sqlite:///{db_path}"
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+
+    # Empty values (rather than unset) stop load_dotenv() picking up real keys
+    os.environ['OPENAI_API_KEY'] = ''
+    os.environ['GEMINI_API_KEY'] = ''
+    stub_server = None
+    if args.provider == 'stub':
+        from bench import stub_llm
+        stub_server, base_url = stub_llm.start_in_thread(
+            port=0, latency_ms=args.stub_latency_ms,
+            jitter_ms=args.stub_jitter_ms, failure_rate=args.stub_failure_rate
+        )
+        os.environ['OPENAI_API_KEY'] = 'stub'
+        os.environ['OPENAI_API_BASE'] = base_url
+
+    # Import after the environment is prepared: app reads it at import time
+    from app import app, db, TaskCompletion
+    from bench.gen_data import generate_rows, populate
+
+    with app.app_context():
+        db.create_all()
+        seeded = populate(db, TaskCompletion, generate_rows(args.years, args.per_day, seed=args.seed))
+    print(f"Seeded {seeded} completions ({args.years} years) into {db_path}")
+
+    client = app.test_client()
+    results = {}
+    for name in args.routes:
+        method, path, build_payload = ROUTES[name]
+        for i in range(args.warmup):
+            client.open(path, method=method, json=build_payload(i, args.repeat_input) if build_payload else None)
+
+        latencies = []
+        errors = 0
+        wall_start = time.perf_counter()
+        # Numbered after the warmup calls so distinct inputs don't repeat them
+        for i in range(args.warmup, args.warmup + args.iterations):
+            payload = build_payload(i, args.repeat_input) if build_payload else None
+            start = time.perf_counter()
+            response = client.open(path, method=method, json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+        results[name] = summarize(latencies, errors, time.perf_counter() - wall_start)
+
+    if stub_server:
+        stub_server.shutdown()
+
+    config = {
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'years': args.years,
+        'per_day': args.per_day,
+        'seeded_rows': seeded,
+        'provider': args.provider,
+        'repeat_input': args.repeat_input
+    }
+    if args.provider == 'stub':
+        config.update(stub_latency_ms=args.stub_latency_ms, stub_failure_rate=args.stub_failure_rate)
+    return config, results
+
+def run_load(args):
+    """Benchmark routes over HTTP with a pool of concurrent clients"""
+    import requests
+
+    local = threading.local()
+    base_url = args.url.rstrip('/')
+
+    def session():
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        return local.session
+
+    def one_request(method, url, payload):
+        start = time.perf_counter()
+        try:
+            response = session().request(method, url, json=payload, timeout=args.timeout)
+            failed = response.status_code >= 400
+        except requests.RequestException:
+            failed = True
+        return time.perf_counter() - start, failed
+
+    results = {}
+    for name in args.routes:
+        method, path, build_payload = ROUTES[name]
+        url = base_url + path
+        jobs = [
+            (method, url, build_payload(i, args.repeat_input) if build_payload else None)
+            for i in range(args.requests)
+        ]
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            wall_start = time.perf_counter()
+            outcomes = list(pool.map(lambda job: one_request(*job), jobs))
+            wall_seconds = time.perf_counter() - wall_start
+        latencies = [latency for latency, _ in outcomes]
+        errors = sum(1 for _, failed in outcomes if failed)
+        results[name] = summarize(latencies, errors, wall_seconds)
+
+    config = {
+        'url': base_url,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'repeat_input': args.repeat_input
+    }
+    return config, results
+
+def print_results(results):
+    header = f"{'route':<15}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, stats in results.items():
+        print(
+            f"{name:<15}{stats['count']:>7}{stats['errors']:>8}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+            f"{stats['throughput_rps']:>10.1f}"
+        )
+
+def print_comparison(baseline, current):
+    """Print per-route deltas between two saved runs"""
+    print(f"{'route':<15}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, stats in current['routes'].items():
+        base = baseline['routes'].get(name)
+        if not base:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps'):
+            before, after = base[metric], stats[metric]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else 'n/a'
+            print(f"{name:<15}{metric:<16}{before:>12.2f}{after:>12.2f}{change:>10}")
+
+def save_results(mode, config, results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    timestamp = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(RESULTS_DIR, f"{timestamp}-{mode}.json")
+    with open(path, 'w') as f:
+        json.dump({'mode': mode, 'timestamp': timestamp, 'config': config, 'routes': results}, f, indent=2)
+    return path
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+
+    def add_common(sub):
+        sub.add_argument('--routes', nargs='+', choices=list(ROUTES), default=list(ROUTES))
+        sub.add_argument('--repeat-input', action='store_true',
+                         help='send the same /analyze input every time, measuring cache hits instead of provider calls')
+        sub.add_argument('--baseline', help='saved result file to compare against')
+        sub.add_argument('--no-save', action='store_true', help="don't write results to bench/results/")
+
+    micro = subparsers.add_parser('micro', help='in-process benchmark with the Flask test client')
+    add_common(micro)
+    micro.add_argument('--iterations', type=int, default=200)
+    micro.add_argument('--warmup', type=int, default=10)
+    micro.add_argument('--years', type=float, default=1, help='years of synthetic history to seed')
+    micro.add_argument('--per-day', type=int, default=5)
+    micro.add_argument('--seed', type=int, default=0)
+    micro.add_argument('--provider', choices=['fallback', 'stub'], default='fallback')
+    micro.add_argument('--stub-latency-ms', type=float, default=0)
+    micro.add_argument('--stub-jitter-ms', type=float, default=0)
+    micro.add_argument('--stub-failure-rate', type=float, default=0.0)
+
+    load = subparsers.add_parser('load', help='concurrent HTTP benchmark against a running server')
+    add_common(load)
+    load.add_argument('--url', default='http://127.0.0.1:5001')
+    load.add_argument('--requests', type=int, default=500, help='requests per route')
+    load.add_argument('--concurrency', type=int, default=8)
+    load.add_argument('--timeout', type=float, default=60)
+
+    compare = subparsers.add_parser('compare', help='compare two saved result files')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+
+    args = parser.parse_args()
+
+    if args.mode == 'compare':
+        print_comparison(load_results(args.baseline), load_results(args.current))
+        return
+
+    config, results = run_micro(args) if args.mode == 'micro' else run_load(args)
+    print_results(results)
+
+    current = {'mode': args.mode, 'config': config, 'routes': results}
+    if not args.no_save:
+        print(f"Saved results to {save_results(args.mode, config, results)}")
+    if args.baseline:
+        print()
+        print_comparison(load_results(args.baseline), current)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Local stub for the OpenAI and Gemini endpoints used by app.py.
+
+Point the app at it with:
+    OPENAI_API_KEY=stub OPENAI_API_BASE=http://127.0.0.1:8765 python app.py
+    GEMINI_API_KEY=stub GEMINI_API_BASE=http://127.0.0.1:8765 python app.py
+
+Responses are built from the prompt (scores for every listed task, or a
+detail object for a single task) so the app parses them like real output.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMOJIS = ["📋", "💼", "📚", "🔧", "💡", "🚀", "⚡", "🎨", "🔍", "📝"]
+
+def build_reply(prompt):
+    """Build the model's text reply for an app.py prompt"""
+    if 'Provide detailed analysis for this task only' in prompt:
+        return json.dumps({
+            "justification": "Stub justification.",
+            "comparison": "Stub comparison.",
+            "ranking_reason": "Stub ranking reason."
+        })
+
+    # Numbered task lines, e.g. "3. Update my resume"
+    tasks = re.findall(r'^\d+\. (.+)$', prompt, flags=re.MULTILINE)
+    analyzed = []
+    for i, task in enumerate(tasks):
+        seed = int(hashlib.md5(task.encode()).hexdigest(), 16)
+        analyzed.append({
+            "task_name": task,
+            "impact": seed % 10 + 1,
+            "effort": seed // 10 % 10 + 1,
+            "emoji": EMOJIS[i % len(EMOJIS)]
+        })
+    return json.dumps(analyzed)
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Set on the class by make_server()
+    latency_ms = 0
+    jitter_ms = 0
+    failure_rate = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if random.random() < self.failure_rate:
+            self.send_json(500, {"error": {"message": "Stub injected failure"}})
+            return
+
+        if self.path.startswith('/v1/chat/completions'):
+            prompt = body['messages'][-1]['content']
+            self.send_json(200, {
+                "choices": [{"message": {"role": "assistant", "content": build_reply(prompt)}}]
+            })
+        elif ':generateContent' in self.path:
+            prompt = body['contents'][0]['parts'][0]['text']
+            self.send_json(200, {
+                "candidates": [{"content": {"parts": [{"text": build_reply(prompt)}]}}]
+            })
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+def make_server(host='127.0.0.1', port=8765, latency_ms=0, jitter_ms=0, failure_rate=0.0):
+    """Create (but don't start) a stub server; port=0 picks a free port"""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {
+        'latency_ms': latency_ms,
+        'jitter_ms': jitter_ms,
+        'failure_rate': failure_rate
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+def start_in_thread(**kwargs):
+    """Start a stub server in a daemon thread and return (server, base_url)"""
+    server = make_server(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=500, help='mean response latency')
+    parser.add_argument('--jitter-ms', type=float, default=100, help='uniform +/- jitter on latency')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of calls answered with HTTP 500')
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency_ms, args.jitter_ms, args.failure_rate)
+    print(f"Stub LLM listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import math
+from functools import lru_cache
+
+# Orbit rings, innermost first, by minimum impact (same bands as the
+# priority icons in index.html)
+RING_MIN_IMPACT = (8, 6, 4, 1)
+
+# Impact/effort chart quadrants; scores >= 6 count as high
+QUADRANTS = ('quick_win', 'major_project', 'fill_in', 'thankless')
+HIGH_SCORE = 6
+
+# Rotate each ring by the golden angle so planets in neighbouring rings don't line up
+RING_OFFSET = math.pi * (3 - math.sqrt(5))
+
+def _score(value):
+    """Coerce a model-provided score (int, float or numeric string) to an int in 1..10"""
+    try:
+        return min(10, max(1, round(float(value))))
+    except (TypeError, ValueError, OverflowError):
+        return 1
+
+def compute_layout(analyzed_tasks):
+    """
+    Precompute render positions for analyzed tasks as arrays aligned with
+    the task list: orbit ring and angle (radians) for the solar system,
+    quadrant index and overlap-adjusted impact for the impact/effort chart,
+    plus the 1-10 impact they were computed from.
+    """
+    # Items that aren't objects get the lowest scores, keeping arrays aligned with the tasks
+    scores = tuple(
+        (_score(task.get('impact')), _score(task.get('effort'))) if isinstance(task, dict) else (1, 1)
+        for task in analyzed_tasks
+    )
+    return dict(_layout_for_scores(scores))
+
+@lru_cache(maxsize=1024)
+def _layout_for_scores(scores):
+    # Layout only depends on the ordered scores, so identical analyses share it
+    rings = []
+    for impact, _ in scores:
+        rings.append(next(i for i, minimum in enumerate(RING_MIN_IMPACT) if impact >= minimum))
+
+    ring_sizes = [rings.count(ring) for ring in range(len(RING_MIN_IMPACT))]
+    seen_in_ring = [0] * len(RING_MIN_IMPACT)
+    angles = []
+    for ring in rings:
+        step = 2 * math.pi / ring_sizes[ring]
+        angle = (ring * RING_OFFSET + seen_in_ring[ring] * step) % (2 * math.pi)
+        angles.append(round(angle, 4))
+        seen_in_ring[ring] += 1
+
+    # Index into QUADRANTS: low impact adds 2, high effort adds 1
+    quadrants = [
+        (0 if impact >= HIGH_SCORE else 2) + (1 if effort >= HIGH_SCORE else 0)
+        for impact, effort in scores
+    ]
+
+    # Move a task down one impact level at a time while its chart cell is taken
+    used = set()
+    display_impact = []
+    for impact, effort in scores:
+        shown = impact
+        while (effort, shown) in used and shown > 1:
+            shown -= 1
+        used.add((effort, shown))
+        display_impact.append(shown)
+
+    return {
+        'impact': tuple(impact for impact, _ in scores),
+        'ring': tuple(rings),
+        'angle': tuple(angles),
+        'quadrant': tuple(quadrants),
+        'display_impact': tuple(display_impact),
+        'ring_count': len(RING_MIN_IMPACT),
+        'quadrants': QUADRANTS
+    }
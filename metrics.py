@@ -0,0 +1,211 @@
+import glob
+import json
+import os
+import threading
+import time
+
+# Default latency buckets in seconds (roughly the Prometheus client defaults)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = [
+        (name, str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'))
+        for name, value in pairs
+    ]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def merge(total, values):
+        for key, value in values.items():
+            total[key] = total.get(key, 0) + value
+
+    def render(self, values, label_names):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} counter'
+        ]
+        for key, value in sorted(values.items()):
+            lines.append(f'{self.name}{_format_labels(label_names, key)} {_format_value(value)}')
+        return lines
+
+class Histogram:
+    """Cumulative bucketed histogram, optionally split by labels"""
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['buckets'][i] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {key: dict(state, buckets=list(state['buckets'])) for key, state in self._values.items()}
+
+    @staticmethod
+    def merge(total, values):
+        for key, state in values.items():
+            if key not in total:
+                total[key] = dict(state, buckets=list(state['buckets']))
+                continue
+            merged = total[key]
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], state['buckets'])]
+            merged['sum'] += state['sum']
+            merged['count'] += state['count']
+
+    def render(self, values, label_names):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} histogram'
+        ]
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['buckets']):
+                cumulative += count
+                labels = _format_labels(label_names, key, ('le', _format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(label_names, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(state["sum"])}')
+            lines.append(f'{self.name}_count{labels} {state["count"]}')
+        return lines
+
+class Registry:
+    """
+    Collection of metrics rendered together in Prometheus text format.
+
+    Metrics live in each process's memory. Under a multi-worker server
+    (gunicorn --workers N) pass a `shared_dir`: every worker saves its
+    values there (within `dump_interval` seconds of maybe_dump() calls)
+    and render() sums all workers' files, so a scrape sees the same totals
+    whichever worker answers. Without a shared_dir every series gets a
+    `worker` label with the process id so workers' series stay apart.
+    """
+
+    def __init__(self, shared_dir=None, dump_interval=1.0):
+        self._metrics = []
+        self.shared_dir = shared_dir
+        self.dump_interval = dump_interval
+        self._last_dump = 0.0
+        self._pending_dump = None
+        self._dump_lock = threading.Lock()
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+
+    def counter(self, name, documentation, labels=()):
+        metric = Counter(name, documentation, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def dump(self):
+        """Write this process's values to the shared directory"""
+        state = {
+            metric.name: [[list(key), value] for key, value in metric.snapshot().items()]
+            for metric in self._metrics
+        }
+        path = os.path.join(self.shared_dir, f'{os.getpid()}.json')
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        # Atomic, so readers never see a half-written file
+        os.replace(temp_path, path)
+        self._last_dump = time.monotonic()
+
+    def maybe_dump(self):
+        """Save now if the last save is old enough, else schedule one"""
+        if not self.shared_dir:
+            return
+        with self._dump_lock:
+            if self._pending_dump is not None:
+                return
+            wait = self.dump_interval - (time.monotonic() - self._last_dump)
+            if wait > 0:
+                # Deferred so an idle worker's last requests still get saved
+                self._pending_dump = threading.Timer(wait, self._deferred_dump)
+                self._pending_dump.daemon = True
+                self._pending_dump.start()
+                return
+        self.dump()
+
+    def _deferred_dump(self):
+        with self._dump_lock:
+            self._pending_dump = None
+        self.dump()
+
+    def render(self):
+        if not self.shared_dir:
+            worker = (str(os.getpid()),)
+            lines = []
+            for metric in self._metrics:
+                values = {worker + key: value for key, value in metric.snapshot().items()}
+                lines.extend(metric.render(values, ('worker',) + metric.label_names))
+            return '\n'.join(lines) + '\n'
+
+        self.dump()
+        totals = {metric.name: {} for metric in self._metrics}
+        for path in glob.glob(os.path.join(self.shared_dir, '*.json')):
+            try:
+                with open(path) as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for metric in self._metrics:
+                values = {tuple(key): value for key, value in state.get(metric.name, [])}
+                metric.merge(totals[metric.name], values)
+
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(totals[metric.name], metric.label_names))
+        return '\n'.join(lines) + '\n'
+
+# Content type for the Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
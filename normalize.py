@@ -0,0 +1,194 @@
+import hashlib
+import random
+import threading
+import unicodedata
+import zlib
+
+# Sentence punctuation, dropped from the edges of words. Symbols that can
+# carry meaning (C++, C#, $500, 50%, v1.2) are kept.
+_EDGE_PUNCTUATION = '.,;:!?"\'`()[]{}<>\u2026\u201c\u201d\u2018\u2019\u00ab\u00bb-\u2013\u2014_*~'
+
+def normalize_text(text):
+    """Fold case, unicode forms, whitespace and punctuation around words"""
+    text = unicodedata.normalize('NFKC', text).casefold()
+    words = (word.strip(_EDGE_PUNCTUATION) for word in text.split())
+    return ' '.join(word for word in words if word)
+
+def canonical_tasks(tasks):
+    """Sorted, de-duplicated normalized tasks (order-insensitive)"""
+    return tuple(sorted({normalize_text(task) for task in tasks} - {''}))
+
+def canonical_key(goal, tasks):
+    """Stable key shared by every trivial variation of a goal + task set"""
+    canonical = normalize_text(goal) + '\n' + '\n'.join(canonical_tasks(tasks))
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+def shingles(text, k=3):
+    """Character k-grams of already-normalized text"""
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+# MinHash permutations: h(x) = (a * crc32(x) + b) mod a Mersenne prime
+_PRIME = (1 << 61) - 1
+_NUM_PERM = 64
+_BANDS = 16
+_ROWS = _NUM_PERM // _BANDS
+_rng = random.Random(1)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(_NUM_PERM)]
+
+def minhash(shingle_set):
+    hashes = [zlib.crc32(shingle.encode()) for shingle in shingle_set]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+def task_set_shingles(tasks):
+    """Shingles of a whole task set; task order doesn't matter"""
+    result = set()
+    for task in canonical_tasks(tasks):
+        result |= shingles(task)
+    return result
+
+# Words that flip or qualify a task's meaning while barely changing its text
+NEGATIONS = {
+    'no', 'not', 'never', 'without', "don't", 'dont', "doesn't", "didn't",
+    "won't", "can't", 'cannot', 'stop', 'avoid', 'skip', 'quit'
+}
+
+def _meaning_markers(normalized_task):
+    """Negations and numbers in a task; near-duplicates must agree on these"""
+    words = normalized_task.split()
+    return (
+        frozenset(word for word in words if word in NEGATIONS),
+        tuple(word for word in words if any(ch.isdigit() for ch in word))
+    )
+
+class AnalysisIndex:
+    """
+    In-memory store of analyses keyed by canonical form, so requests that
+    differ only in case, whitespace, punctuation or task order reuse the
+    same result. With a fuzzy threshold (0-1), near-identical task sets are
+    also matched using MinHash + LSH banding on character shingles, but
+    only under the same normalized goal (scores depend on the goal), and a
+    task only matches one with the same negations and numbers.
+    """
+
+    def __init__(self, max_size=1000, fuzzy_threshold=None):
+        self.max_size = max_size
+        self.fuzzy_threshold = fuzzy_threshold
+        self._entries = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get(self, goal, tasks):
+        """
+        Return (analysis, match) where match is 'exact', 'fuzzy' or None.
+        The analysis is rebuilt in the request's task order and wording.
+        """
+        key = canonical_key(goal, tasks)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                analysis = self._rebuild(entry, tasks, fuzzy=False)
+                if analysis is not None:
+                    return analysis, 'exact'
+            if not self.fuzzy_threshold:
+                return None, None
+
+            goal_key = normalize_text(goal)
+            signature = minhash(task_set_shingles(tasks))
+            candidates = set()
+            for band in self._bands(goal_key, signature):
+                candidates |= self._buckets.get(band, set())
+            for candidate in candidates:
+                entry = self._entries[candidate]
+                if entry['goal'] != goal_key:
+                    continue
+                similarity = sum(x == y for x, y in zip(signature, entry['signature'])) / _NUM_PERM
+                if similarity < self.fuzzy_threshold:
+                    continue
+                analysis = self._rebuild(entry, tasks, fuzzy=True)
+                if analysis is not None:
+                    return analysis, 'fuzzy'
+        return None, None
+
+    def put(self, goal, tasks, analysis):
+        key = canonical_key(goal, tasks)
+        by_task = self._pair_with_tasks(tasks, analysis)
+        goal_key = normalize_text(goal)
+        signature = minhash(task_set_shingles(tasks)) if self.fuzzy_threshold else None
+
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_size:
+                # Evict the oldest entry (dicts keep insertion order)
+                self._remove(next(iter(self._entries)))
+            self._remove(key)
+            self._entries[key] = {'goal': goal_key, 'tasks': by_task, 'signature': signature}
+            if signature is not None:
+                for band in self._bands(goal_key, signature):
+                    self._buckets.setdefault(band, set()).add(key)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None or entry['signature'] is None:
+            return
+        for band in self._bands(entry['goal'], entry['signature']):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    @staticmethod
+    def _pair_with_tasks(tasks, analysis):
+        """
+        Key analysis items by the request's normalized tasks. Models often
+        reword task names, so items are paired by position unless their
+        names already cover every task (the model may have reordered them).
+        """
+        items = [item for item in analysis if isinstance(item, dict)] if isinstance(analysis, list) else []
+        normalized_tasks = [normalize_text(task) for task in tasks]
+        by_name = {
+            normalize_text(item['task_name']): item
+            for item in items if isinstance(item.get('task_name'), str)
+        }
+        if all(task in by_name for task in normalized_tasks):
+            return {task: by_name[task] for task in normalized_tasks}
+        if len(items) == len(tasks):
+            return dict(zip(normalized_tasks, items))
+        return by_name
+
+    def _bands(self, goal_key, signature):
+        # Buckets include the goal, so only entries for the same goal collide
+        return [(goal_key, i, signature[i * _ROWS:(i + 1) * _ROWS]) for i in range(_BANDS)]
+
+    def _rebuild(self, entry, tasks, fuzzy):
+        """Map stored per-task results onto the requested tasks, or None if any task has no match"""
+        stored = entry['tasks']
+        analysis = []
+        for task in tasks:
+            normalized = normalize_text(task)
+            item = stored.get(normalized)
+            if item is None and fuzzy:
+                task_shingles = shingles(normalized)
+                markers = _meaning_markers(normalized)
+                best_score, best_item = 0.0, None
+                for stored_task, stored_item in stored.items():
+                    if _meaning_markers(stored_task) != markers:
+                        continue
+                    score = jaccard(task_shingles, shingles(stored_task))
+                    if score > best_score:
+                        best_score, best_item = score, stored_item
+                if best_score >= self.fuzzy_threshold:
+                    item = best_item
+            if item is None:
+                return None
+            analysis.append(dict(item, task_name=task))
+        return analysis
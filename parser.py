@@ -1,4 +1,8 @@
+import argparse
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 def extract_tasks(raw_text):
     try:
@@ -7,4 +11,112 @@ def extract_tasks(raw_text):
         goal = data.get("goal", "No goal found")
         return tasks, goal
     except json.JSONDecodeError:
-        return [], "Invalid JSON format"
\ No newline at end of file
+        return [], "Invalid JSON format"
+
+def normalize_request(data):
+    """
+    Validate a logged /analyze request and return (goal, tasks).
+    Tasks may be a list or a newline-separated string; blank tasks are
+    dropped. Raises ValueError if the record is unusable.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("record is not a JSON object")
+
+    goal = data.get("goal")
+    if not isinstance(goal, str) or not goal.strip():
+        raise ValueError("missing goal")
+
+    tasks = data.get("tasks")
+    if isinstance(tasks, str):
+        tasks = tasks.split("\n")
+    if not isinstance(tasks, list):
+        raise ValueError("missing tasks")
+    tasks = [task.strip() for task in tasks if isinstance(task, str) and task.strip()]
+    if not tasks:
+        raise ValueError("missing tasks")
+
+    return goal.strip(), tasks
+
+def iter_requests(lines, on_error=None):
+    """
+    Lazily parse JSON lines into (goal, tasks) pairs, one line in memory at
+    a time. Invalid lines are skipped and reported to
+    on_error(line_number, reason) if given.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield normalize_request(json.loads(line))
+        except (json.JSONDecodeError, ValueError) as e:
+            if on_error is not None:
+                on_error(line_number, str(e))
+
+def batched(iterable, size):
+    """Yield lists of up to `size` items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def replay(lines, analyze, batch_size=50, workers=1, on_error=None):
+    """
+    Feed logged requests through `analyze(goal, tasks)` batch by batch,
+    yielding (goal, tasks, result). With workers > 1 each batch runs on a
+    thread pool; only one batch is in flight, so memory stays bounded.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in batched(iter_requests(lines, on_error), batch_size):
+            results = pool.map(lambda request: analyze(*request), batch)
+            for (goal, tasks), result in zip(batch, results):
+                yield goal, tasks, result
+
+def positive_int(value):
+    """argparse type for options that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a JSONL log of /analyze requests ({\"goal\": ..., \"tasks\": [...]} per line) "
+                    "through the AI providers, writing one JSON result per line to stdout. Point the app's "
+                    "ANALYSIS_WARM_FILE at the output to serve these analyses without calling the providers."
+    )
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file (default: stdin)")
+    parser.add_argument("--batch-size", type=positive_int, default=50)
+    parser.add_argument("--workers", type=positive_int, default=1, help="concurrent analyses per batch")
+    args = parser.parse_args()
+
+    from app import get_provider_analysis
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    skipped = 0
+    processed = 0
+    failed = 0
+
+    def report_error(line_number, reason):
+        nonlocal skipped
+        skipped += 1
+        if skipped <= 20:
+            print(f"line {line_number}: {reason}", file=sys.stderr)
+
+    try:
+        for goal, tasks, result in replay(source, get_provider_analysis, args.batch_size, args.workers, report_error):
+            if result is None:
+                # No provider answered; placeholder scores aren't worth saving
+                failed += 1
+                continue
+            sys.stdout.write(json.dumps({"goal": goal, "tasks": tasks, "analyzed_tasks": result}, ensure_ascii=False) + "\n")
+            processed += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    print(f"Analyzed {processed} requests, {failed} failed, skipped {skipped} invalid lines", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
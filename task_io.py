@@ -0,0 +1,152 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import select, bindparam, String, Integer, DateTime
+
+FIELDS = ['task_name', 'goal', 'completed_at', 'impact_score', 'effort_score']
+
+def iter_completions(db, model, batch_size=1000):
+    """
+    Yield completion rows as dicts, oldest id first, using a server-side
+    cursor so memory stays constant however large the table is.
+    """
+    table = model.__table__
+    result = db.session.execute(
+        select(table).order_by(table.c.id).execution_options(stream_results=True)
+    )
+    for row in result.yield_per(batch_size).mappings():
+        yield {
+            'id': row['id'],
+            'task_name': row['task_name'],
+            'goal': row['goal'],
+            'completed_at': row['completed_at'].isoformat() if row['completed_at'] else None,
+            'impact_score': row['impact_score'],
+            'effort_score': row['effort_score']
+        }
+
+def to_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+def to_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=['id'] + FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def parse_ndjson(lines):
+    """Yield a dict (or None for an unparseable line) per non-blank line"""
+    for line in lines:
+        try:
+            if isinstance(line, bytes):
+                # utf-8-sig drops a byte order mark at the start of the file
+                line = line.decode('utf-8-sig')
+            if not line.strip():
+                continue
+            record = json.loads(line.lstrip('\ufeff'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            yield None
+            continue
+        yield record if isinstance(record, dict) else None
+
+def parse_csv(text_stream):
+    """Yield a dict per CSV row; the first row must be a header"""
+    for record in csv.DictReader(text_stream):
+        yield record
+
+def normalize_record(record):
+    """Validate an imported record; returns a row dict or None if invalid"""
+    if not record:
+        return None
+    task_name = record.get('task_name')
+    goal = record.get('goal')
+    completed_at = record.get('completed_at')
+    if not all(isinstance(value, str) for value in (task_name, goal, completed_at)):
+        return None
+    task_name = task_name.strip()
+    goal = goal.strip()
+    if not task_name or not goal or len(task_name) > 200 or len(goal) > 200:
+        return None
+
+    try:
+        completed_at = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if completed_at.tzinfo is not None:
+        # Stored naive in UTC, like datetime.utcnow() in the model
+        completed_at = completed_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+    row = {'task_name': task_name, 'goal': goal, 'completed_at': completed_at}
+    for field in ('impact_score', 'effort_score'):
+        value = record.get(field)
+        if value in (None, ''):
+            row[field] = None
+            continue
+        try:
+            row[field] = int(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+    return row
+
+def insert_if_missing_statement(model):
+    """
+    INSERT ... SELECT ... WHERE NOT EXISTS on (task_name, goal, completed_at).
+    Run with executemany; rows already in the table (or earlier in the same
+    batch) are skipped.
+    """
+    table = model.__table__
+    params = [
+        bindparam('task_name', type_=String),
+        bindparam('goal', type_=String),
+        bindparam('completed_at', type_=DateTime),
+        bindparam('impact_score', type_=Integer),
+        bindparam('effort_score', type_=Integer)
+    ]
+    already_stored = select(table.c.id).where(
+        table.c.task_name == bindparam('task_name', type_=String),
+        table.c.goal == bindparam('goal', type_=String),
+        table.c.completed_at == bindparam('completed_at', type_=DateTime)
+    ).exists()
+    return table.insert().from_select(FIELDS, select(*params).where(~already_stored))
+
+def import_records(db, model, records, chunk_size=10000):
+    """
+    Bulk insert records in chunks, one transaction per chunk, skipping
+    duplicates. Returns counts of inserted, duplicate and invalid records.
+    """
+    # Older databases were created before the dedupe index existed
+    for index in model.__table__.indexes:
+        index.create(bind=db.engine, checkfirst=True)
+
+    statement = insert_if_missing_statement(model)
+    counts = {'inserted': 0, 'duplicates': 0, 'invalid': 0}
+
+    def flush(chunk):
+        try:
+            inserted = db.session.execute(statement, chunk).rowcount
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        counts['inserted'] += inserted
+        counts['duplicates'] += len(chunk) - inserted
+
+    chunk = []
+    for record in records:
+        row = normalize_record(record)
+        if row is None:
+            counts['invalid'] += 1
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+    return counts
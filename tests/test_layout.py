@@ -0,0 +1,14 @@
+import layout
+
+def test_scores_are_rounded_and_clamped():
+    result = layout.compute_layout([
+        {'impact': '7.5', 'effort': 3.2},
+        {'impact': 42, 'effort': 'high'},
+        {'impact': None}
+    ])
+    assert result['impact'] == (8, 10, 1)
+
+def test_bad_items_keep_arrays_aligned():
+    result = layout.compute_layout([{'impact': 9, 'effort': 2}, 'not a task', None])
+    assert result['impact'] == (9, 1, 1)
+    assert len(result['ring']) == len(result['angle']) == len(result['quadrant']) == 3
@@ -0,0 +1,52 @@
+import normalize
+from normalize import AnalysisIndex
+
+GOAL = "Get a job as a Software Engineer"
+TASKS = [
+    "Apply to 15 jobs on LinkedIn",
+    "Build a portfolio website",
+    "Practice coding interviews",
+    "Update my resume",
+    "Attend tech meetups"
+]
+
+def scored(tasks):
+    return [{"task_name": task, "impact": i + 1, "effort": 10 - i, "emoji": "📋"} for i, task in enumerate(tasks)]
+
+def fuzzy_index():
+    index = AnalysisIndex(fuzzy_threshold=0.8)
+    index.put(GOAL, TASKS, scored(TASKS))
+    return index
+
+def test_trivial_variations_share_an_exact_match():
+    index = fuzzy_index()
+    variant = ["  update MY resume.", "ATTEND tech meetups!", *TASKS[:3]]
+    analysis, match = index.get("get a job as a software engineer!", variant)
+    assert match == 'exact'
+    assert [item["task_name"] for item in analysis] == variant
+    assert [item["impact"] for item in analysis] == [4, 5, 1, 2, 3]
+
+def test_near_identical_wording_is_a_fuzzy_match():
+    index = fuzzy_index()
+    tasks = TASKS[:-1] + ["Attend tech meetup"]
+    analysis, match = index.get(GOAL, tasks)
+    assert match == 'fuzzy'
+    assert analysis[-1]["impact"] == 5
+
+def test_different_goal_never_matches():
+    index = fuzzy_index()
+    assert index.get("Get a job as a Data Engineer", TASKS) == (None, None)
+
+def test_negated_task_never_matches():
+    index = fuzzy_index()
+    tasks = ["Don't apply to 15 jobs on LinkedIn"] + TASKS[1:]
+    assert index.get(GOAL, tasks) == (None, None)
+
+def test_different_number_never_matches():
+    index = fuzzy_index()
+    tasks = ["Apply to 50 jobs on LinkedIn"] + TASKS[1:]
+    assert index.get(GOAL, tasks) == (None, None)
+
+def test_meaningful_symbols_are_kept():
+    assert normalize.canonical_key("Get hired", ["Learn C++"]) != normalize.canonical_key("Get hired", ["Learn C#"])
+    assert normalize.normalize_text("Pay $500.") != normalize.normalize_text("Pay 500")
@@ -0,0 +1,27 @@
+import io
+
+import task_io
+
+ROW = {'task_name': 'Update my resume', 'goal': 'Get a job', 'completed_at': '2024-05-01T09:30:00Z'}
+
+def test_valid_record_is_normalized():
+    row = task_io.normalize_record(dict(ROW, impact_score='7'))
+    assert row['completed_at'].isoformat() == '2024-05-01T09:30:00'
+    assert row['impact_score'] == 7
+    assert row['effort_score'] is None
+
+def test_non_string_fields_are_invalid():
+    for field, value in (('task_name', 123), ('goal', ['a']), ('completed_at', 1714555800)):
+        assert task_io.normalize_record(dict(ROW, **{field: value})) is None
+
+def test_bom_prefixed_csv_is_read():
+    body = '\ufefftask_name,goal,completed_at\nUpdate my resume,Get a job,2024-05-01T09:30:00\n'
+    stream = io.TextIOWrapper(io.BytesIO(body.encode('utf-8')), encoding='utf-8-sig', newline='')
+    rows = [task_io.normalize_record(record) for record in task_io.parse_csv(stream)]
+    assert rows[0] is not None and rows[0]['task_name'] == 'Update my resume'
+
+def test_bom_prefixed_ndjson_is_read():
+    lines = ['\ufeff{"task_name": "a", "goal": "b", "completed_at": "2024-05-01"}\n'.encode('utf-8'), b'\xff\n']
+    records = list(task_io.parse_ndjson(lines))
+    assert records[0]['task_name'] == 'a'
+    assert records[1] is None